@@ -5,65 +5,171 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from inotify_simple import INotify, flags
+    HAS_INOTIFY = True
+except ImportError:
+    HAS_INOTIFY = False
+
 WATCH_DIRS = [
     "api_data_aadhar_enrolment",
     "api_data_aadhar_demographic",
     "api_data_aadhar_biometric"
 ]
 
+# Events that mean a CSV finished changing on disk
+_INOTIFY_EVENTS = None
+if HAS_INOTIFY:
+    _INOTIFY_EVENTS = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+
+# Coalesce bursts of events (multi-file unzips, chunked downloads)
+DEBOUNCE_SECONDS = 0.5
+
+def _scan_csv_mtimes(path):
+    """Recursively yield st_mtime for every CSV under path using os.scandir.
+
+    DirEntry.stat() reuses the data the kernel returned from readdir, so this
+    issues far fewer syscalls than rglob("*.csv") + Path.stat() per file.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from _scan_csv_mtimes(entry.path)
+                    elif entry.name.endswith(".csv"):
+                        yield entry.stat().st_mtime
+                except OSError:
+                    pass
+    except FileNotFoundError:
+        return
+
 def get_latest_mtime(base_path):
     """Get the latest modification time of any CSV in the watched directories."""
     latest = 0
     for d in WATCH_DIRS:
-        # Check both flat and nested structures
-        paths = [
-            base_path / d,
-            base_path / d / d
-        ]
-        
-        for p in paths:
-            if p.exists():
-                for f in p.rglob("*.csv"):
-                    try:
-                        mtime = f.stat().st_mtime
-                        if mtime > latest:
-                            latest = mtime
-                    except OSError:
-                        pass
+        # Recursion handles both flat and nested (dir/dir) structures
+        for mtime in _scan_csv_mtimes(os.path.join(str(base_path), d)):
+            if mtime > latest:
+                latest = mtime
     return latest
 
+def run_processor(base_path):
+    """Run the data processor. Returns True on success."""
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] New data detected! Triggering processor...")
+
+    start_time = time.time()
+    result = subprocess.run(
+        ["python", "scripts/data_processor.py"],
+        cwd=base_path,
+        capture_output=False # Let it print to console
+    )
+
+    duration = time.time() - start_time
+
+    if result.returncode == 0:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing complete ({duration:.1f}s). Dashboard updated.")
+        return True
+    else:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing FAILED.")
+        return False
+
+def _add_watches_recursive(inotify, path):
+    """Watch a directory tree; inotify watches are per-directory, not recursive."""
+    try:
+        inotify.add_watch(path, _INOTIFY_EVENTS)
+    except FileNotFoundError:
+        return
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    _add_watches_recursive(inotify, entry.path)
+    except FileNotFoundError:
+        pass
+
+def watch_inotify(base_path):
+    """Block on kernel inotify events instead of polling the CSV tree."""
+    inotify = INotify()
+    # Watch base_path itself: the data directories may not exist yet
+    # (fresh clone, watcher started before the first download), and their
+    # creation is the event that arms the per-directory watches below
+    try:
+        inotify.add_watch(str(base_path), _INOTIFY_EVENTS)
+    except FileNotFoundError:
+        pass
+    for d in WATCH_DIRS:
+        _add_watches_recursive(inotify, os.path.join(str(base_path), d))
+
+    retry_pending = False
+
+    while True:
+        if retry_pending:
+            # Match the polling loop's recovery: a failed run is retried
+            # after the poll interval even if no new events arrive
+            events = inotify.read(timeout=10 * 1000)
+            if not events:
+                retry_pending = not run_processor(base_path)
+                continue
+        else:
+            # Block until something changes
+            events = inotify.read()
+
+        # Debounce to coalesce bursts
+        while True:
+            more = inotify.read(timeout=int(DEBOUNCE_SECONDS * 1000))
+            if not more:
+                break
+            events.extend(more)
+
+        data_changed = False
+        rearm = False
+        for e in events:
+            if e.name.endswith(".csv"):
+                data_changed = True
+            elif e.mask & (flags.CREATE | flags.MOVED_TO):
+                # New directories (created, or moved into place by the
+                # common unzip-to-tmp-then-rename pattern) need their own
+                # watches; inotify watches are not recursive
+                rearm = True
+                if e.mask & flags.MOVED_TO:
+                    # A moved-in directory arrives already populated, so
+                    # its CSVs never produce events of their own - treat
+                    # the move itself as a data change
+                    data_changed = True
+
+        if rearm:
+            for d in WATCH_DIRS:
+                _add_watches_recursive(inotify, os.path.join(str(base_path), d))
+
+        if data_changed:
+            retry_pending = not run_processor(base_path)
+
+def watch_polling(base_path):
+    """Fallback for platforms without inotify: poll mtimes every 10 seconds."""
+    last_mtime = get_latest_mtime(base_path)
+
+    while True:
+        time.sleep(10) # Check every 10 seconds
+        current_mtime = get_latest_mtime(base_path)
+
+        if current_mtime > last_mtime:
+            if run_processor(base_path):
+                last_mtime = current_mtime
+            # On failure don't update last_mtime so we retry on next change
+
 def main():
     base_path = Path(".")
     print(f"[{datetime.now().strftime('%H:%M:%S')}] starting Auto-Pipeline Watcher...")
     print(f"Watching directories: {', '.join(WATCH_DIRS)}")
-    
-    last_mtime = get_latest_mtime(base_path)
-    
+
     try:
-        while True:
-            time.sleep(10) # Check every 10 seconds
-            current_mtime = get_latest_mtime(base_path)
-            
-            if current_mtime > last_mtime:
-                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] New data detected! Triggering processor...")
-                
-                # Run the processor
-                start_time = time.time()
-                result = subprocess.run(
-                    ["python", "scripts/data_processor.py"], 
-                    cwd=base_path,
-                    capture_output=False # Let it print to console
-                )
-                
-                duration = time.time() - start_time
-                
-                if result.returncode == 0:
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing complete ({duration:.1f}s). Dashboard updated.")
-                    last_mtime = current_mtime
-                else:
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing FAILED.")
-                    # Don't update last_mtime so we retry on next change or if we restart
-            
+        if HAS_INOTIFY:
+            print("Using inotify (event-driven)")
+            watch_inotify(base_path)
+        else:
+            print("inotify_simple not available, falling back to polling")
+            watch_polling(base_path)
     except KeyboardInterrupt:
         print("\nWatcher stopped.")
 
@@ -4,12 +4,25 @@ Handles both complete download and state-wise download file structures.
 """
 
 import csv
+import io
+import itertools
+import json
 import os
+import sys
+import threading
 from pathlib import Path
 from typing import Dict, List, Generator, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
 
 @dataclass
 class DatasetConfig:
@@ -19,10 +32,143 @@ class DatasetConfig:
     columns: List[str]
     date_column: str = "date"
     geo_columns: List[str] = None
-    
+
     def __post_init__(self):
         if self.geo_columns is None:
             self.geo_columns = ["state", "district", "pincode"]
+        # Derived lookups for the per-row hot paths: O(1) membership and a
+        # ready-made numeric column tuple instead of rebuilding per caller
+        self._geo_set = frozenset(self.geo_columns)
+        self._numeric_cols = tuple(
+            c for c in self.columns
+            if c not in self._geo_set and c != self.date_column
+        )
+
+    def arrow_schema(self):
+        """
+        Explicit Arrow schema: timestamp for the date, int32 for counts.
+        Geo columns are dictionary-encoded - one int32 code per row plus a
+        small table of unique strings, instead of a string object per row.
+        """
+        fields = []
+        for col in self.columns:
+            if col == self.date_column:
+                fields.append((col, pa.timestamp("s")))
+            elif col in self.geo_columns:
+                fields.append((col, pa.dictionary(pa.int32(), pa.large_string())))
+            else:
+                fields.append((col, pa.int32()))
+        return pa.schema(fields)
+
+
+# On-disk discover_files cache, keyed by resolved directory and its mtime
+_DISCOVER_CACHE_PATH = Path.home() / ".cache" / "uidai" / "discover.json"
+
+
+def _dir_mtime_signature(path) -> Optional[float]:
+    """
+    Max mtime of the directory and every subdirectory below it. Adding or
+    removing a file always bumps its parent directory's mtime, so this
+    signature also invalidates for the nested state-wise layout, where
+    new CSVs land one level below the dataset directory.
+    """
+    try:
+        latest = os.stat(path).st_mtime
+    except OSError:
+        return None
+
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            mtime = entry.stat().st_mtime
+                            if mtime > latest:
+                                latest = mtime
+                            stack.append(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return latest
+
+
+def _list_csv_files(path, recursive: bool = False) -> List[Path]:
+    """List CSVs via os.scandir, filtering by name before any stat call"""
+    files = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.endswith(".csv") and entry.is_file(follow_symlinks=False):
+                    files.append(Path(entry.path))
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    files.extend(_list_csv_files(entry.path, recursive=True))
+    except FileNotFoundError:
+        pass
+    return files
+
+
+def _open_csv_text(file_path) -> io.TextIOWrapper:
+    """
+    Open a CSV for reading with a 1 MiB binary buffer instead of the 8 KiB
+    text-mode default, and hint the kernel to read ahead sequentially.
+    """
+    f = open(file_path, 'rb', buffering=1 << 20)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return io.TextIOWrapper(f, encoding='utf-8', newline='')
+
+
+def _advise_willneed(files: List[Path]) -> None:
+    """
+    Queue asynchronous readahead for a batch of files before parsing.
+
+    POSIX_FADV_WILLNEED returns immediately, so the kernel pulls later
+    files into the page cache while earlier ones are still being parsed.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for file_path in files:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _parse_dmy(value: str) -> datetime:
+    """Parse DD-MM-YYYY without strptime's per-call format compilation"""
+    return datetime(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+
+
+def _parse_ymd(value: str) -> datetime:
+    """Parse YYYY-MM-DD without strptime's per-call format compilation"""
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def _parse_date_slow(value: str) -> Optional[datetime]:
+    """strptime fallback for values the positional parsers reject.
+
+    strptime accepts unpadded day/month fields, which the slicing parsers
+    cannot; this keeps the fallback path's accepted dates identical to the
+    Arrow path's pc.strptime coercion.
+    """
+    for fmt in ("%d-%m-%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    return None
 
 
 # Default column mappings based on actual UIDAI datasets
@@ -53,7 +199,14 @@ class UIDAIDataLoader:
     
     def __init__(self, base_dir: str = "."):
         self.base_dir = Path(base_dir)
-        
+        # Dataset stats captured as a side effect of a full fallback pass,
+        # so get_date_range/get_unique_values don't re-parse every CSV
+        self._stats: Dict[str, Dict] = {}
+        self._discover_cache: Optional[Dict] = None
+        # discover_files runs from the exporter's worker threads; the
+        # shared cache dict and its file need single-writer discipline
+        self._discover_lock = threading.Lock()
+
     def discover_files(self, dataset_type: str) -> List[Path]:
         """Discover all CSV files for a dataset type"""
         config = DATASET_CONFIGS.get(dataset_type)
@@ -72,41 +225,192 @@ class UIDAIDataLoader:
                 else:
                     raise FileNotFoundError(f"Dataset directory not found: {dataset_path}")
         
-        csv_files = list(dataset_path.glob("*.csv"))
+        # Skip the file walk if the directory tree hasn't changed since
+        # the last run (the auto-pipeline re-invokes this process per
+        # change); the signature covers subdirectory mtimes so nested
+        # layouts invalidate too
+        dir_mtime = _dir_mtime_signature(dataset_path)
+
+        # Resolved so checkouts sharing the cache file can't collide on
+        # a relative path
+        cache_key = str(dataset_path.resolve())
+        if dir_mtime is not None:
+            with self._discover_lock:
+                cache = self._load_discover_cache()
+                entry = cache.get(cache_key)
+            if entry and entry.get("mtime") == dir_mtime:
+                return [Path(p) for p in entry["files"]]
+
+        csv_files = _list_csv_files(dataset_path)
         if not csv_files:
             # Check for nested structure one level deeper
-            csv_files = list(dataset_path.glob("**/*.csv"))
-            
-        return sorted(csv_files)
+            csv_files = _list_csv_files(dataset_path, recursive=True)
+
+        csv_files = sorted(csv_files)
+
+        if dir_mtime is not None:
+            with self._discover_lock:
+                cache[cache_key] = {
+                    "mtime": dir_mtime,
+                    "files": [str(p) for p in csv_files],
+                }
+                self._save_discover_cache(cache)
+
+        return csv_files
+
+    def _load_discover_cache(self) -> Dict:
+        if self._discover_cache is None:
+            try:
+                with open(_DISCOVER_CACHE_PATH) as f:
+                    self._discover_cache = json.load(f)
+            except (OSError, ValueError):
+                self._discover_cache = {}
+        return self._discover_cache
+
+    def _save_discover_cache(self, cache: Dict) -> None:
+        try:
+            _DISCOVER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(_DISCOVER_CACHE_PATH, "w") as f:
+                # Snapshot so a concurrent insert can't change the dict
+                # mid-serialization (callers hold _discover_lock anyway)
+                json.dump(dict(cache), f)
+        except OSError:
+            pass  # cache is best-effort only
     
+    def load_batches(self, dataset_type: str, columns: Optional[List[str]] = None):
+        """
+        Stream the dataset as pyarrow RecordBatches (requires pyarrow).
+
+        The CSV parse happens in C over large blocks with an explicit schema,
+        which is far faster than the row-at-a-time csv.DictReader path.
+        Pass columns to parse only a subset (e.g. just the date column).
+        """
+        if not HAS_ARROW:
+            raise RuntimeError("pyarrow is required for load_batches")
+
+        files = self.discover_files(dataset_type)
+        _advise_willneed(files)
+        config = DATASET_CONFIGS[dataset_type]
+        schema = config.arrow_schema()
+
+        # Date and count columns are parsed as strings and coerced by the
+        # compute kernels in _normalize_batch: a strict typed parse would
+        # abort the whole run on one malformed cell, where _clean_row
+        # degrades bad dates to None and bad counts to 0
+        column_types = {field.name: field.type for field in schema}
+        for name in (config.date_column,) + config._numeric_cols:
+            column_types[name] = pa.large_string()
+
+        read_options = pacsv.ReadOptions(block_size=8 << 20)
+        convert_options = pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=columns if columns is not None else config.columns,
+            include_missing_columns=True,
+            null_values=[""],
+            strings_can_be_null=True,
+        )
+
+        for file_path in files:
+            with pacsv.open_csv(
+                file_path,
+                read_options=read_options,
+                convert_options=convert_options,
+            ) as reader:
+                for batch in reader:
+                    yield self._normalize_batch(batch, config)
+
+    # Count values are accepted through this pattern before the int cast;
+    # capping at 9 digits keeps every match inside int32
+    _COUNT_PATTERN = r"^-?\d{1,9}$"
+
+    def _normalize_batch(self, batch, config: DatasetConfig):
+        """
+        Coerce string-parsed columns to the target schema with _clean_row
+        semantics - unparseable dates become null, non-numeric counts
+        become 0 - and fill nulls (0 for counts, '' for geo).
+        """
+        arrays = []
+        for i, name in enumerate(batch.schema.names):
+            column = batch.column(i)
+            is_string = pa.types.is_large_string(column.type) or pa.types.is_string(column.type)
+            if name == config.date_column:
+                if is_string:
+                    trimmed = pc.utf8_trim_whitespace(column)
+                    dmy = pc.strptime(trimmed, "%d-%m-%Y", "s", error_is_null=True)
+                    ymd = pc.strptime(trimmed, "%Y-%m-%d", "s", error_is_null=True)
+                    column = pc.if_else(pc.is_valid(dmy), dmy, ymd)
+                arrays.append(column)
+            elif name in config._geo_set:
+                arrays.append(pc.fill_null(column, ""))
+            else:
+                if is_string:
+                    trimmed = pc.utf8_trim_whitespace(column)
+                    valid = pc.match_substring_regex(trimmed, self._COUNT_PATTERN)
+                    column = pc.cast(pc.if_else(valid, trimmed, "0"), pa.int32())
+                arrays.append(pc.fill_null(column, 0))
+        return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
     def load_dataset(
-        self, 
+        self,
         dataset_type: str,
         chunk_size: int = 10000
     ) -> Generator[List[Dict], None, None]:
         """
         Load dataset in chunks for memory efficiency.
         Yields batches of rows as dictionaries.
+
+        When pyarrow is available this is a thin dict adapter over
+        load_batches; otherwise it falls back to csv.DictReader.
         """
+        if HAS_ARROW:
+            for batch in self.load_batches(dataset_type):
+                rows = batch.to_pylist()
+                for start in range(0, len(rows), chunk_size):
+                    yield rows[start:start + chunk_size]
+            return
+
         files = self.discover_files(dataset_type)
+        _advise_willneed(files)
         config = DATASET_CONFIGS[dataset_type]
-        
+
+        # Capture stats during the pass so get_date_range/get_unique_values
+        # don't need their own full re-parse afterwards
+        min_date = None
+        max_date = None
+        uniques = {col: set() for col in config.geo_columns}
+
         for file_path in files:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with _open_csv_text(file_path) as f:
                 reader = csv.DictReader(f)
                 batch = []
-                
+
                 for row in reader:
                     # Clean and normalize row
                     cleaned_row = self._clean_row(row, config)
                     batch.append(cleaned_row)
-                    
+
+                    date = cleaned_row.get(config.date_column)
+                    if date:
+                        if min_date is None or date < min_date:
+                            min_date = date
+                        if max_date is None or date > max_date:
+                            max_date = date
+                    for col, seen in uniques.items():
+                        seen.add(cleaned_row[col])
+
                     if len(batch) >= chunk_size:
                         yield batch
                         batch = []
-                
+
                 if batch:
                     yield batch
+
+        # Only cache once the full pass completed (generator fully consumed)
+        self._stats[dataset_type] = {
+            "min_date": min_date,
+            "max_date": max_date,
+            "uniques": uniques,
+        }
     
     def load_full_dataset(self, dataset_type: str) -> List[Dict]:
         """Load entire dataset into memory (use with caution for large datasets)"""
@@ -118,22 +422,28 @@ class UIDAIDataLoader:
     def _clean_row(self, row: Dict, config: DatasetConfig) -> Dict:
         """Clean and validate a single row"""
         cleaned = {}
-        
+        date_column = config.date_column
+        geo_columns = config._geo_set
+        get = row.get
+
         for col in config.columns:
-            value = row.get(col, "").strip()
-            
-            if col == config.date_column:
-                # Parse date (expected format: DD-MM-YYYY)
+            value = get(col, "").strip()
+
+            if col == date_column:
+                # The separator position distinguishes DD-MM-YYYY from
+                # YYYY-MM-DD; one try catches malformed values
                 try:
-                    cleaned[col] = datetime.strptime(value, "%d-%m-%Y")
-                except ValueError:
-                    try:
-                        cleaned[col] = datetime.strptime(value, "%Y-%m-%d")
-                    except ValueError:
-                        cleaned[col] = None
-            elif col in config.geo_columns:
-                # Keep geographic columns as strings
-                cleaned[col] = value
+                    parse = _parse_dmy if value[2] == "-" else _parse_ymd
+                    cleaned[col] = parse(value)
+                except (ValueError, IndexError):
+                    # The slicing parsers assume zero-padded fields; fall
+                    # back to strptime so unpadded dates ("3-12-2024")
+                    # still parse and only genuinely bad values become None
+                    cleaned[col] = _parse_date_slow(value)
+            elif col in geo_columns:
+                # Keep geographic columns as strings; interning makes the
+                # millions of repeated state/district values share storage
+                cleaned[col] = sys.intern(value)
             else:
                 # Numeric columns
                 try:
@@ -143,11 +453,49 @@ class UIDAIDataLoader:
         
         return cleaned
     
+    def sample(self, dataset_type: str, n: int) -> List[Dict]:
+        """
+        Read just the first n rows of the dataset. Unlike load_dataset this
+        never parses beyond the requested rows, so the demo/smoke-test path
+        costs O(n) rather than a scan of the whole dataset. Spans files so
+        chunked and state-wise layouts still fill the sample.
+        """
+        config = DATASET_CONFIGS[dataset_type]
+        rows = []
+
+        for file_path in self.discover_files(dataset_type):
+            with _open_csv_text(file_path) as f:
+                reader = csv.DictReader(f)
+                rows.extend(
+                    self._clean_row(row, config)
+                    for row in itertools.islice(reader, n - len(rows))
+                )
+            if len(rows) >= n:
+                break
+
+        return rows
+
     def get_date_range(self, dataset_type: str) -> tuple:
         """Get min and max dates in dataset"""
+        cached = self._stats.get(dataset_type)
+        if cached:
+            return cached["min_date"], cached["max_date"]
+
         min_date = None
         max_date = None
-        
+
+        if HAS_ARROW:
+            # Parse only the date column and use the C min_max kernel
+            config = DATASET_CONFIGS[dataset_type]
+            for batch in self.load_batches(dataset_type, columns=[config.date_column]):
+                mm = pc.min_max(batch.column(0))
+                lo, hi = mm["min"].as_py(), mm["max"].as_py()
+                if lo is not None and (min_date is None or lo < min_date):
+                    min_date = lo
+                if hi is not None and (max_date is None or hi > max_date):
+                    max_date = hi
+            return min_date, max_date
+
         for batch in self.load_dataset(dataset_type, chunk_size=50000):
             for row in batch:
                 date = row.get("date")
@@ -156,12 +504,23 @@ class UIDAIDataLoader:
                         min_date = date
                     if max_date is None or date > max_date:
                         max_date = date
-        
+
         return min_date, max_date
-    
+
     def get_unique_values(self, dataset_type: str, column: str) -> set:
         """Get unique values for a column (useful for states/districts)"""
+        cached = self._stats.get(dataset_type)
+        if cached and column in cached["uniques"]:
+            return cached["uniques"][column]
+
         values = set()
+
+        if HAS_ARROW:
+            # Parse only the requested column and use the C unique kernel
+            for batch in self.load_batches(dataset_type, columns=[column]):
+                values.update(pc.unique(batch.column(0)).to_pylist())
+            return values
+
         for batch in self.load_dataset(dataset_type, chunk_size=50000):
             for row in batch:
                 if column in row:
@@ -175,12 +534,7 @@ def get_sample_data(loader: UIDAIDataLoader, sample_size: int = 1000) -> Dict:
     
     for dataset_type in DATASET_CONFIGS.keys():
         try:
-            data = []
-            for batch in loader.load_dataset(dataset_type, chunk_size=sample_size):
-                data.extend(batch[:sample_size])
-                if len(data) >= sample_size:
-                    break
-            sample[dataset_type] = data[:sample_size]
+            sample[dataset_type] = loader.sample(dataset_type, sample_size)
         except FileNotFoundError:
             print(f"Warning: {dataset_type} dataset not found")
             sample[dataset_type] = []
@@ -3,15 +3,70 @@ UIDAI Data Processor - Main pipeline script
 Loads CSVs, aggregates data, computes metrics, and exports JSON for frontend.
 """
 
+import gzip
 import json
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from data_loader import UIDAIDataLoader, DATASET_CONFIGS
-from metrics import MetricsCalculator, InsightGenerator, MBULoad
+from data_loader import UIDAIDataLoader, DATASET_CONFIGS, HAS_ARROW
+from metrics import MetricsCalculator, InsightGenerator, MBULoad, group_by_state
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_default(obj):
+    """Fallback encoder hook: dataclasses to dicts, anything else via str"""
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+
+def write_json(path: Path, obj) -> None:
+    """
+    Serialize compactly - orjson writes from C when available and walks
+    dataclasses natively, so result objects need no Python-side dict copy.
+    """
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, default=_json_default)
+
+
+def write_metrics_ndjson_gz(path: Path, metrics: Dict) -> None:
+    """
+    Stream metrics as gzipped newline-delimited JSON, one record per
+    (kind, period). Numeric-heavy JSON compresses ~8-10x, and a streaming
+    consumer can start rendering periods before the download finishes.
+    """
+    if HAS_ORJSON:
+        dumps = lambda obj: orjson.dumps(obj, default=str)
+    else:
+        dumps = lambda obj: json.dumps(obj, default=_json_default).encode()
+
+    with gzip.open(path, "wb", compresslevel=3) as f:
+        for kind in ("msi", "demand_proxies", "mbu_load"):
+            for period, rows in metrics[kind].items():
+                f.write(dumps({"kind": kind, "period": period, "rows": rows}))
+                f.write(b"\n")
+        for state, by_period in metrics["insights_by_state"].items():
+            f.write(dumps({"kind": "insights", "state": state, "periods": by_period}))
+            f.write(b"\n")
 
 
 class DataProcessor:
@@ -32,35 +87,102 @@ class DataProcessor:
         Aggregate data by time period and geographic region.
         Returns: {period: {region_key: {field: value}}}
         """
-        aggregated = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-        
+        if HAS_PANDAS and HAS_ARROW:
+            return self._aggregate_vectorized(dataset_type, period_type)
+
+        # Hoist invariants out of the per-row loop
+        config = DATASET_CONFIGS[dataset_type]
+        numeric_cols = config._numeric_cols
+        monthly = period_type == "monthly"
+
+        # Flat accumulator keyed by (period, region_key, col): one hash per
+        # update instead of three chained defaultdict probes, and no dict
+        # objects allocated per new (period, region) pair
+        flat = {}
+        flat_get = flat.get
+
         for batch in self.loader.load_dataset(dataset_type):
             for row in batch:
-                date = row.get("date")
+                get = row.get
+                date = get("date")
                 if not date:
                     continue
-                
+
                 # Determine period
-                if period_type == "monthly":
+                if monthly:
                     period = date.strftime("%Y-%m")
                 else:  # quarterly
                     quarter = (date.month - 1) // 3 + 1
                     period = f"{date.year}-Q{quarter}"
-                
+
                 # Build region key
-                state = row.get("state", "Unknown")
-                district = row.get("district", "Unknown")
-                pincode = row.get("pincode", "000000")
-                region_key = f"{state}|{district}|{pincode}"
-                
+                region_key = "|".join((
+                    get("state", "Unknown"),
+                    get("district", "Unknown"),
+                    get("pincode", "000000"),
+                ))
+
                 # Aggregate numeric fields
-                config = DATASET_CONFIGS[dataset_type]
-                for col in config.columns:
-                    if col not in ["date", "state", "district", "pincode"]:
-                        aggregated[period][region_key][col] += row.get(col, 0)
-        
-        return dict(aggregated)
-    
+                for col in numeric_cols:
+                    key = (period, region_key, col)
+                    flat[key] = flat_get(key, 0) + (get(col, 0) or 0)
+
+        # Fold back into the nested shape once, at the boundary
+        aggregated = {}
+        for (period, region_key, col), value in flat.items():
+            aggregated.setdefault(period, {}).setdefault(region_key, {})[col] = value
+
+        return aggregated
+
+    def _aggregate_vectorized(
+        self,
+        dataset_type: str,
+        period_type: str = "monthly"
+    ) -> Dict[str, Dict[str, Dict]]:
+        """
+        Vectorized aggregation: groupby-sum each Arrow batch in pandas and
+        accumulate partial sums, so the per-row work stays in C.
+        """
+        config = DATASET_CONFIGS[dataset_type]
+        numeric_cols = list(config._numeric_cols)
+
+        totals = None
+        for batch in self.loader.load_batches(dataset_type):
+            df = batch.to_pandas()
+            df = df[df["date"].notna()]
+            if df.empty:
+                continue
+
+            # Determine period (vectorized)
+            if period_type == "monthly":
+                df["period"] = df["date"].dt.strftime("%Y-%m")
+            else:  # quarterly
+                quarter = (df["date"].dt.month - 1) // 3 + 1
+                df["period"] = (
+                    df["date"].dt.year.astype(str) + "-Q" + quarter.astype(str)
+                )
+
+            partial = df.groupby(
+                ["period", "state", "district", "pincode"],
+                observed=True, sort=False
+            )[numeric_cols].sum()
+
+            totals = partial if totals is None else totals.add(partial, fill_value=0)
+
+        # Fold back into the nested-dict shape at the API boundary
+        aggregated = {}
+        if totals is None:
+            return aggregated
+
+        for row in totals.reset_index().itertuples(index=False):
+            period, state, district, pincode = row[:4]
+            region_key = f"{state}|{district}|{pincode}"
+            aggregated.setdefault(period, {})[region_key] = {
+                col: int(value) for col, value in zip(numeric_cols, row[4:])
+            }
+
+        return aggregated
+
     def compute_all_metrics(
         self, 
         enrolment_data: Dict,
@@ -83,13 +205,20 @@ class DataProcessor:
         ))
         
         previous_enrolment = {}
-        historical_bio = defaultdict(list)
-        
+        # Online mean per region: (count, running_sum), updated in O(1)
+        historical_bio = {}
+
+        # First pass: build the merged per-region view for every period.
+        # The derived rates depend on the previous period, so this stays
+        # sequential, but having all periods up front lets the MSI
+        # numerics run as one threaded batch below.
+        merged_by_period = {}
+        previous_by_period = {}
+
         for period in all_periods:
             enrol = enrolment_data.get(period, {})
             demo = demographic_data.get(period, {})
-            bio = biometric_data.get(period, {})
-            
+
             # Merge data for MSI computation
             merged = defaultdict(dict)
             for region_key in set(list(enrol.keys()) + list(demo.keys())):
@@ -113,54 +242,69 @@ class DataProcessor:
                     merged[region_key]["adult_enrolment_growth"] = 0
                 
                 # Enrollment decline (negative growth in total)
-                prev_total = sum(prev.values()) if prev else 0
+                prev_total = prev.get("_total_enrol", 0)
                 if prev_total > 0:
                     merged[region_key]["enrolment_decline"] = (prev_total - total_enrol) / prev_total
                 else:
                     merged[region_key]["enrolment_decline"] = 0
-                
+
                 # Copy raw values
                 merged[region_key].update(e)
                 merged[region_key].update(d)
-            
-            # Compute MSI
-            msi_results = self.metrics.compute_msi(dict(merged), period)
-            results["msi"][period] = [self._result_to_dict(r) for r in msi_results]
-            
+
+                # Cached so next period reads the total in O(1)
+                merged[region_key]["_total_enrol"] = total_enrol
+
+            merged_by_period[period] = merged
+            previous_by_period[period] = previous_enrolment
+            # Nothing mutates merged after this point, so rebinding
+            # avoids a full copy
+            previous_enrolment = merged
+
+        # Compute MSI for all periods in one threaded batch (the watch
+        # history is still applied in period order inside the batch)
+        results["msi"] = self.metrics.compute_msi_batch(merged_by_period)
+
+        for period in all_periods:
+            merged = merged_by_period[period]
+            bio = biometric_data.get(period, {})
+            msi_results = results["msi"][period]
+
             # Compute demand proxies
-            demand_results = self.metrics.compute_demand_proxies(dict(merged), previous_enrolment, period)
-            results["demand_proxies"][period] = [self._result_to_dict(r) for r in demand_results]
-            
+            demand_results = self.metrics.compute_demand_proxies(
+                merged, previous_by_period[period], period
+            )
+            results["demand_proxies"][period] = demand_results
+
             # Update historical averages for MBU
             for region_key, data in bio.items():
                 total = data.get("bio_age_5_17", 0) + data.get("bio_age_17_", 0)
-                historical_bio[region_key].append(total)
-            
+                count, running = historical_bio.get(region_key, (0, 0))
+                historical_bio[region_key] = (count + 1, running + total)
+
             # Compute MBU load
-            historical_avg = {k: sum(v) / len(v) for k, v in historical_bio.items() if v}
+            historical_avg = {k: s / c for k, (c, s) in historical_bio.items()}
             mbu_results = self.metrics.compute_mbu_load(bio, historical_avg, period)
-            results["mbu_load"][period] = [self._result_to_dict(r) for r in mbu_results]
+            results["mbu_load"][period] = mbu_results
             
-            # Generate insights by state
-            states = set(r.region_key.split("|")[0] for r in msi_results)
-            for state in states:
-                if state not in results["insights_by_state"]:
-                    results["insights_by_state"][state] = {}
-                
+            # Generate insights by state: index each result list once so
+            # every state sees only its own slice instead of re-scanning
+            # the full lists per state
+            msi_by_state = group_by_state(msi_results)
+            demand_by_state = group_by_state(demand_results)
+            mbu_by_state = group_by_state(mbu_results)
+
+            for state in msi_by_state.keys() | demand_by_state.keys() | mbu_by_state.keys():
                 insights = self.insights.generate_insights(
-                    msi_results, demand_results, mbu_results, state
+                    msi_by_state.get(state, []),
+                    demand_by_state.get(state, []),
+                    mbu_by_state.get(state, []),
+                    state
                 )
-                results["insights_by_state"][state][period] = insights
-            
-            # Store for next iteration
-            previous_enrolment = dict(merged)
-        
+                results["insights_by_state"].setdefault(state, {})[period] = insights
+
         return results
     
-    def _result_to_dict(self, obj) -> Dict:
-        """Convert dataclass to dict"""
-        return {k: v for k, v in obj.__dict__.items()}
-    
     def generate_summary_stats(self, metrics: Dict) -> Dict:
         """Generate national summary statistics"""
         summary = {
@@ -185,7 +329,7 @@ class DataProcessor:
         summary["total_regions"] = len(latest_msi)
         
         for r in latest_msi:
-            classification = r.get("classification", "Stable")
+            classification = r.classification
             if classification == "Critical":
                 summary["critical_regions"] += 1
             elif classification == "Watch":
@@ -193,7 +337,7 @@ class DataProcessor:
             else:
                 summary["stable_regions"] += 1
             
-            parts = r.get("region_key", "").split("|")
+            parts = r.region_key.split("|")
             if len(parts) >= 3:
                 summary["states"].append(parts[0])
                 summary["districts"].add(parts[1])
@@ -206,7 +350,7 @@ class DataProcessor:
         # MBU stats
         if latest_period in metrics["mbu_load"]:
             for m in metrics["mbu_load"][latest_period]:
-                if m.get("backlog_signal", 0) > 0.3:
+                if m.backlog_signal > 0.3:
                     summary["high_mbu_regions"] += 1
         
         return summary
@@ -217,16 +361,21 @@ class DataProcessor:
         output_path.mkdir(parents=True, exist_ok=True)
         
         print("Loading and aggregating datasets...")
-        
-        # Aggregate each dataset
-        print("  Processing enrolment data...")
-        enrolment = self.aggregate_by_period_and_region("enrolment", "monthly")
-        
-        print("  Processing demographic data...")
-        demographic = self.aggregate_by_period_and_region("demographic", "monthly")
-        
-        print("  Processing biometric data...")
-        biometric = self.aggregate_by_period_and_region("biometric", "monthly")
+
+        # The three datasets live in disjoint directories and produce
+        # disjoint outputs, so aggregate them concurrently. Threads are
+        # enough: the Arrow CSV parse and pandas groupby release the GIL.
+        print("  Processing enrolment, demographic and biometric data...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                dataset_type: executor.submit(
+                    self.aggregate_by_period_and_region, dataset_type, "monthly"
+                )
+                for dataset_type in ("enrolment", "demographic", "biometric")
+            }
+            enrolment = futures["enrolment"].result()
+            demographic = futures["demographic"].result()
+            biometric = futures["biometric"].result()
         
         print("Computing metrics...")
         metrics = self.compute_all_metrics(enrolment, demographic, biometric)
@@ -237,17 +386,15 @@ class DataProcessor:
         # Export files
         print("Exporting JSON files...")
         
-        # Full metrics
-        with open(output_path / "metrics.json", "w") as f:
-            json.dump(metrics, f, indent=2, default=str)
-        
+        # Full metrics, plus a gzipped NDJSON variant for streaming consumers
+        write_json(output_path / "metrics.json", metrics)
+        write_metrics_ndjson_gz(output_path / "metrics.ndjson.gz", metrics)
+
         # Summary
-        with open(output_path / "summary.json", "w") as f:
-            json.dump(summary, f, indent=2, default=str)
-        
+        write_json(output_path / "summary.json", summary)
+
         # State list for dropdowns
-        with open(output_path / "states.json", "w") as f:
-            json.dump(summary["states"], f, indent=2)
+        write_json(output_path / "states.json", summary["states"])
         
         print(f"✓ Exported to {output_path}")
         print(f"  - Total regions: {summary['total_regions']}")
@@ -5,13 +5,45 @@ Computes Migration Stress Index (MSI), Infrastructure Demand Proxies, and MBU Lo
 IMPORTANT: All outputs are proxy-based indicators. They do not represent exact migration flows.
 """
 
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
-from statistics import mean, stdev
-from collections import defaultdict
+import os
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from math import sqrt
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
-@dataclass
+try:
+    from numba import njit
+    HAS_NUMBA = HAS_NUMPY
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+
+def _split_region_key(region_key: str) -> Tuple[str, str, str]:
+    """Parse state|district|pincode once at construction; the state is
+    interned so all records of a state share one string object"""
+    parts = region_key.split("|")
+    while len(parts) < 3:
+        parts.append("")
+    return sys.intern(parts[0]), parts[1], parts[2]
+
+
+@dataclass(slots=True)
 class MSIResult:
     """Migration Stress Index result for a region"""
     region_key: str  # state|district|pincode
@@ -22,9 +54,15 @@ class MSIResult:
     adult_enrolment_zscore: float
     enrolment_decline_zscore: float
     consecutive_watch_periods: int = 0
+    state: str = field(init=False, default="")
+    district: str = field(init=False, default="")
+    pincode: str = field(init=False, default="")
 
+    def __post_init__(self):
+        self.state, self.district, self.pincode = _split_region_key(self.region_key)
 
-@dataclass  
+
+@dataclass(slots=True)
 class DemandProxy:
     """Infrastructure demand proxy result"""
     region_key: str
@@ -34,9 +72,15 @@ class DemandProxy:
     child_growth_rate: float
     adult_growth_rate: float
     address_intensity: float
+    state: str = field(init=False, default="")
+    district: str = field(init=False, default="")
+    pincode: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.state, self.district, self.pincode = _split_region_key(self.region_key)
 
 
-@dataclass
+@dataclass(slots=True)
 class MBULoad:
     """Mandatory Biometric Update load metrics"""
     region_key: str
@@ -45,20 +89,91 @@ class MBULoad:
     age_5_17_load: int
     backlog_signal: float  # > 0 means above average
     priority_rank: int
+    state: str = field(init=False, default="")
+    district: str = field(init=False, default="")
+    pincode: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.state, self.district, self.pincode = _split_region_key(self.region_key)
+
+
+def extract_columns(records: Dict[str, Dict], fields) -> Dict[str, "np.ndarray"]:
+    """
+    AoS -> SoA: pull the requested fields out of {region_key: {field: value}}
+    into one contiguous float64 array per field (requires numpy). Downstream
+    math then runs as ufuncs over the columns instead of per-region dict
+    lookups.
+    """
+    count = len(records)
+    return {
+        field: np.fromiter(
+            (d.get(field, 0) for d in records.values()), np.float64, count
+        )
+        for field in fields
+    }
+
+
+def _aligned_columns(keys: List[str], records: Dict[str, Dict], fields) -> Dict[str, "np.ndarray"]:
+    """Like extract_columns, but aligned to an external key order (missing
+    regions contribute zeros)"""
+    count = len(keys)
+    empty = {}
+    return {
+        field: np.fromiter(
+            (records.get(k, empty).get(field, 0) for k in keys), np.float64, count
+        )
+        for field in fields
+    }
+
+
+def _zscores(arr) -> "np.ndarray":
+    """Vectorized z-scores for a whole metric column (requires numpy)"""
+    if arr.size < 2:
+        return np.zeros_like(arr)
+
+    std = arr.std(ddof=1)
+    if std == 0:
+        return np.zeros_like(arr)
+
+    return (arr - arr.mean()) / std
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _msi_kernel(addr, adult, decl):
+        """Native-compiled z-scores for the three MSI signal columns"""
+        n = addr.size
+        addr_z = np.zeros(n)
+        adult_z = np.zeros(n)
+        decl_z = np.zeros(n)
+
+        if n > 1:
+            correction = np.sqrt(n / (n - 1.0))  # population -> sample std
+            for src, dst in ((addr, addr_z), (adult, adult_z), (decl, decl_z)):
+                mu = src.mean()
+                std = src.std() * correction
+                if std > 0:
+                    for i in range(n):
+                        dst[i] = (src[i] - mu) / std
+
+        return addr_z, adult_z, decl_z
 
 
 def compute_zscore(value: float, values: List[float]) -> float:
     """Compute z-score for a value given a list of all values"""
-    if len(values) < 2:
+    n = len(values)
+    if n < 2:
         return 0.0
-    
-    avg = mean(values)
-    std = stdev(values)
-    
-    if std == 0:
+
+    # statistics.mean/stdev run exact Fraction arithmetic internally; plain
+    # float sums are accurate enough for proxy metrics and far cheaper
+    avg = sum(values) / n
+    var = sum((v - avg) * (v - avg) for v in values) / (n - 1)
+
+    if var <= 0:
         return 0.0
-    
-    return (value - avg) / std
+
+    return (value - avg) / sqrt(var)
 
 
 def compute_growth_rate(current: float, previous: float) -> float:
@@ -68,6 +183,53 @@ def compute_growth_rate(current: float, previous: float) -> float:
     return (current - previous) / previous
 
 
+def growth_rates(current: "np.ndarray", previous: "np.ndarray") -> "np.ndarray":
+    """
+    compute_growth_rate over whole columns (requires numpy): the zero
+    branches become branchless np.where masks, so the division runs as
+    one SIMD-friendly ufunc pass instead of a Python call per region.
+    """
+    return np.where(
+        previous == 0,
+        np.where(current == 0, 0.0, 1.0),
+        (current - previous) / np.where(previous == 0, 1.0, previous),
+    )
+
+
+def clipped_confidences(values: List[float], base: float, cap: float) -> List[float]:
+    """
+    Confidence scores min(cap, base + |value|) for a batch of candidate
+    signals, computed as one clipped ufunc expression when numpy is
+    available instead of per-record min()/abs() calls.
+    """
+    if HAS_NUMPY and values:
+        arr = np.fromiter(values, np.float64, len(values))
+        return np.minimum(cap, base + np.abs(arr)).tolist()
+    return [min(cap, base + abs(v)) for v in values]
+
+
+def group_by_state(results) -> Dict[str, List]:
+    """
+    Index result objects by state in one pass, so per-state consumers do
+    a dict lookup instead of re-scanning the full list for every state.
+    """
+    grouped: Dict[str, List] = {}
+    for result in results:
+        grouped.setdefault(result.state, []).append(result)
+    return grouped
+
+
+def state_slice(results: List, state: str) -> List:
+    """
+    Slice out one state's results from a state-sorted list (the compute_*
+    methods return state-major order) via binary search — O(log N) per
+    state instead of a full scan.
+    """
+    left = bisect_left(results, state, key=attrgetter("state"))
+    right = bisect_right(results, state, lo=left, key=attrgetter("state"))
+    return results[left:right]
+
+
 class MetricsCalculator:
     """
     Calculate all metrics from aggregated UIDAI data.
@@ -78,18 +240,48 @@ class MetricsCalculator:
     MSI_STABLE_THRESHOLD = 1.0
     MSI_WATCH_THRESHOLD = 2.0
     CONSECUTIVE_PERIODS_FOR_CRITICAL = 3
-    
+
+    # Bound on memoized (period, cache_token) z-score columns
+    ZSCORE_CACHE_SIZE = 128
+
     def __init__(self):
-        self.history = defaultdict(list)  # Track consecutive periods
+        # Only the latest consecutive count per region is ever read, so
+        # keep one int per region instead of a growing list per period
+        self.history: Dict[str, int] = {}
+        self._zscore_cache = {}  # (period, cache_token) -> z-score columns
+        # compute_msi_batch runs the statistics pass on worker threads,
+        # so lookup and evict/insert must not race
+        self._zscore_cache_lock = threading.Lock()
     
+    def _classify(self, region_key: str, msi_score: float) -> Tuple[str, int]:
+        """Update a region's watch history and classify its MSI score"""
+        if msi_score >= self.MSI_WATCH_THRESHOLD:
+            consecutive = self.history.get(region_key, 0) + 1
+        else:
+            consecutive = 0
+
+        self.history[region_key] = consecutive
+
+        if msi_score >= self.MSI_WATCH_THRESHOLD and consecutive >= self.CONSECUTIVE_PERIODS_FOR_CRITICAL:
+            classification = "Critical"
+        elif msi_score >= self.MSI_STABLE_THRESHOLD:
+            classification = "Watch"
+        else:
+            classification = "Stable"
+
+        return classification, consecutive
+
     def compute_msi(
-        self, 
+        self,
         aggregated_data: Dict[str, Dict],
-        period: str
+        period: str,
+        as_table: bool = False,
+        top_k: int = None,
+        cache_token: Optional[str] = None
     ) -> List[MSIResult]:
         """
         Compute Migration Stress Index for all regions in a period.
-        
+
         aggregated_data format:
         {
             "state|district|pincode": {
@@ -101,73 +293,365 @@ class MetricsCalculator:
                 ...
             }
         }
+
+        With as_table=True (requires numpy and pyarrow), returns a
+        columnar pyarrow.Table instead of MSIResult objects, skipping
+        per-region dataclass allocation for bulk export/analytics use.
+
+        With top_k set, only the K highest-MSI regions are materialized
+        (selected in O(N) via argpartition on the numpy path); watch
+        history still advances for every region.
+
+        Long-lived callers that re-serve the same period (e.g. a
+        dashboard process) can pass cache_token - a version marker for
+        the underlying data - to memoize the statistics pass; see
+        _msi_zscore_columns.
         """
-        # First pass: collect all values for z-score calculation
-        address_rates = []
-        adult_growths = []
-        declines = []
-        
-        for region_key, data in aggregated_data.items():
-            address_rates.append(data.get("address_update_rate", 0))
-            adult_growths.append(data.get("adult_enrolment_growth", 0))
-            declines.append(data.get("enrolment_decline", 0))
-        
-        # Second pass: compute z-scores and MSI
+        if as_table and not (HAS_NUMPY and HAS_ARROW):
+            raise ImportError("compute_msi(as_table=True) requires numpy and pyarrow")
+
+        region_keys, addr_zs, adult_zs, decline_zs = self._msi_zscore_columns(
+            aggregated_data, period, cache_token=cache_token
+        )
+
+        if as_table:
+            # Columnar output: the z-score columns flow straight into
+            # Arrow arrays with no per-region MSIResult allocation
+            addr = np.asarray(addr_zs)
+            adult = np.asarray(adult_zs)
+            decl = np.asarray(decline_zs)
+            msi = addr + adult - decl
+
+            classifications = []
+            consecutives = []
+            for region_key, score in zip(region_keys, msi.tolist()):
+                classification, consecutive = self._classify(region_key, score)
+                classifications.append(classification)
+                consecutives.append(consecutive)
+
+            table = pa.table({
+                "region_key": pa.array(region_keys),
+                "period": pa.array([period] * len(region_keys)).dictionary_encode(),
+                "msi_score": msi,
+                "classification": pa.array(classifications).dictionary_encode(),
+                "address_update_zscore": addr,
+                "adult_enrolment_zscore": adult,
+                "enrolment_decline_zscore": decl,
+                "consecutive_watch_periods": pa.array(consecutives, pa.int32()),
+            })
+            # Same ordering as the object path: state-major, highest MSI
+            # first within each state (lexsort's last key is primary)
+            states = np.asarray([k.split("|", 1)[0] for k in region_keys])
+            return table.take(np.lexsort((-msi, states)))
+
+        return self._emit_msi(region_keys, addr_zs, adult_zs, decline_zs, period, top_k)
+
+    def compute_msi_batch(
+        self,
+        period_data: Dict[str, Dict[str, Dict]]
+    ) -> Dict[str, List[MSIResult]]:
+        """
+        Compute MSI for several periods at once.
+
+        The statistics pass for each period is independent and, on the
+        numpy path, spends its time in GIL-releasing ufuncs, so it runs
+        on a thread pool. The consecutive-watch history carries state
+        from one period to the next, so results are assembled
+        sequentially in period order on the calling thread.
+        """
+        periods = sorted(period_data)
+
+        def columns(period):
+            return self._msi_zscore_columns(period_data[period], period)
+
+        if HAS_NUMPY and len(periods) > 1:
+            workers = min(len(periods), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                period_columns = list(pool.map(columns, periods))
+        else:
+            period_columns = [columns(period) for period in periods]
+
+        return {
+            period: self._emit_msi(region_keys, addr_zs, adult_zs, decline_zs, period)
+            for period, (region_keys, addr_zs, adult_zs, decline_zs)
+            in zip(periods, period_columns)
+        }
+
+    # Every column the fused compute_all pass needs from the merged
+    # per-region data: the three MSI signals plus the five demand fields
+    ALL_METRIC_FIELDS = (
+        "address_update_rate", "adult_enrolment_growth", "enrolment_decline",
+        "age_0_5", "age_5_17", "age_18_greater",
+        "demo_age_5_17", "demo_age_17_",
+    )
+
+    def compute_all(
+        self,
+        current_data: Dict[str, Dict],
+        previous_data: Dict[str, Dict],
+        biometric_data: Dict[str, Dict],
+        historical_avg: Dict[str, float],
+        period: str
+    ) -> Tuple[List[MSIResult], List[DemandProxy], List[MBULoad]]:
+        """
+        Fused single-period computation of MSI, demand proxies and MBU
+        load. On the numpy path, every column both metrics need is pulled
+        from current_data in one extraction pass, so each region's dict
+        is hashed once instead of once per metric.
+        """
+        columns = None
+        if HAS_NUMPY and current_data:
+            columns = extract_columns(current_data, self.ALL_METRIC_FIELDS)
+
+        region_keys, addr_zs, adult_zs, decline_zs = self._msi_zscore_columns(
+            current_data, period, columns=columns
+        )
+        msi_results = self._emit_msi(region_keys, addr_zs, adult_zs, decline_zs, period)
+        demand_results = self.compute_demand_proxies(
+            current_data, previous_data, period, columns=columns
+        )
+        mbu_results = self.compute_mbu_load(biometric_data, historical_avg, period)
+
+        return msi_results, demand_results, mbu_results
+
+    def _msi_zscore_columns(
+        self,
+        aggregated_data: Dict[str, Dict],
+        period: str,
+        columns: Dict = None,
+        cache_token: Optional[str] = None
+    ) -> Tuple[List[str], List[float], List[float], List[float]]:
+        """
+        The statistics pass of compute_msi: z-score columns for the three
+        MSI signals. Touches no per-region history, so it is safe to run
+        concurrently. `columns` takes pre-extracted SoA columns (see
+        compute_all) to skip the extraction pass.
+
+        With cache_token set, the columns are memoized under
+        (period, cache_token); the token is the caller's statement that
+        the input for this period is unchanged since the last call with
+        the same token (e.g. a data version or file mtime). Opt-in only:
+        the one-shot batch pipeline never re-enters a period, so caching
+        by default would retain a copy of every period's columns for
+        zero hits.
+        """
+        region_keys = list(aggregated_data.keys())
+        count = len(region_keys)
+
+        cached = None
+        if cache_token is not None:
+            cache_key = (period, cache_token)
+            with self._zscore_cache_lock:
+                cached = self._zscore_cache.get(cache_key)
+
+        if cached is not None:
+            addr_zs, adult_zs, decline_zs = cached
+        elif HAS_NUMPY and count:
+            # Vectorized: extract the three signal columns once (SoA), then
+            # a single mean/std and subtraction/divide per whole column
+            cols = columns if columns is not None else extract_columns(
+                aggregated_data, (
+                    "address_update_rate",
+                    "adult_enrolment_growth",
+                    "enrolment_decline",
+                )
+            )
+            if HAS_NUMBA:
+                addr_z_arr, adult_z_arr, decline_z_arr = _msi_kernel(
+                    cols["address_update_rate"],
+                    cols["adult_enrolment_growth"],
+                    cols["enrolment_decline"],
+                )
+                addr_zs = addr_z_arr.tolist()
+                adult_zs = adult_z_arr.tolist()
+                decline_zs = decline_z_arr.tolist()
+            else:
+                addr_zs = _zscores(cols["address_update_rate"]).tolist()
+                adult_zs = _zscores(cols["adult_enrolment_growth"]).tolist()
+                decline_zs = _zscores(cols["enrolment_decline"]).tolist()
+        else:
+            # Welford's online algorithm: one pass accumulates count, mean
+            # and M2 per signal without materializing three value lists
+            n = 0
+            addr_mu = addr_m2 = 0.0
+            adult_mu = adult_m2 = 0.0
+            decl_mu = decl_m2 = 0.0
+
+            for data in aggregated_data.values():
+                n += 1
+                x = data.get("address_update_rate", 0)
+                delta = x - addr_mu
+                addr_mu += delta / n
+                addr_m2 += delta * (x - addr_mu)
+                x = data.get("adult_enrolment_growth", 0)
+                delta = x - adult_mu
+                adult_mu += delta / n
+                adult_m2 += delta * (x - adult_mu)
+                x = data.get("enrolment_decline", 0)
+                delta = x - decl_mu
+                decl_mu += delta / n
+                decl_m2 += delta * (x - decl_mu)
+
+            if n > 1:
+                addr_std = sqrt(addr_m2 / (n - 1))
+                adult_std = sqrt(adult_m2 / (n - 1))
+                decl_std = sqrt(decl_m2 / (n - 1))
+            else:
+                addr_std = adult_std = decl_std = 0.0
+
+            values = aggregated_data.values()
+            addr_zs = [
+                (d.get("address_update_rate", 0) - addr_mu) / addr_std
+                if addr_std else 0.0
+                for d in values
+            ]
+            adult_zs = [
+                (d.get("adult_enrolment_growth", 0) - adult_mu) / adult_std
+                if adult_std else 0.0
+                for d in values
+            ]
+            decline_zs = [
+                (d.get("enrolment_decline", 0) - decl_mu) / decl_std
+                if decl_std else 0.0
+                for d in values
+            ]
+
+        if cache_token is not None and cached is None:
+            with self._zscore_cache_lock:
+                if len(self._zscore_cache) >= self.ZSCORE_CACHE_SIZE:
+                    # Evict the oldest entry (dicts preserve insertion order)
+                    del self._zscore_cache[next(iter(self._zscore_cache))]
+                self._zscore_cache[cache_key] = (addr_zs, adult_zs, decline_zs)
+
+        return region_keys, addr_zs, adult_zs, decline_zs
+
+    def _emit_msi(
+        self,
+        region_keys: List[str],
+        addr_zs: List[float],
+        adult_zs: List[float],
+        decline_zs: List[float],
+        period: str,
+        top_k: int = None
+    ) -> List[MSIResult]:
+        """Second pass of compute_msi: MSI score, classification and
+        watch-history per region. Must run in period order."""
         results = []
-        
-        for region_key, data in aggregated_data.items():
-            addr_z = compute_zscore(data.get("address_update_rate", 0), address_rates)
-            adult_z = compute_zscore(data.get("adult_enrolment_growth", 0), adult_growths)
-            decline_z = compute_zscore(data.get("enrolment_decline", 0), declines)
-            
+
+        # With top_k, pick the K highest-MSI indices up front so only
+        # those regions allocate an MSIResult; argpartition keeps the
+        # selection O(N) instead of a full sort
+        emit_idx = None
+        if top_k is not None and 0 < top_k < len(region_keys):
+            if HAS_NUMPY:
+                msi = (
+                    np.asarray(addr_zs) + np.asarray(adult_zs) - np.asarray(decline_zs)
+                )
+                emit_idx = set(np.argpartition(-msi, top_k - 1)[:top_k].tolist())
+            else:
+                scores = [
+                    a + b - c for a, b, c in zip(addr_zs, adult_zs, decline_zs)
+                ]
+                emit_idx = set(
+                    sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:top_k]
+                )
+
+        for i, (region_key, addr_z, adult_z, decline_z) in enumerate(zip(
+            region_keys, addr_zs, adult_zs, decline_zs
+        )):
             # MSI Formula: zscore(AddressUpdateRate) + zscore(AdultEnrollmentGrowth) - zscore(EnrollmentDecline)
             msi_score = addr_z + adult_z - decline_z
-            
-            # Track consecutive watch periods
-            prev_count = self.history[region_key][-1] if self.history[region_key] else 0
-            
-            if msi_score >= self.MSI_WATCH_THRESHOLD:
-                consecutive = prev_count + 1
-            else:
-                consecutive = 0
-            
-            self.history[region_key].append(consecutive)
-            
-            # Classify
-            if msi_score >= self.MSI_WATCH_THRESHOLD and consecutive >= self.CONSECUTIVE_PERIODS_FOR_CRITICAL:
-                classification = "Critical"
-            elif msi_score >= self.MSI_STABLE_THRESHOLD:
-                classification = "Watch"
-            else:
-                classification = "Stable"
-            
+            # History advances for every region, emitted or not
+            classification, consecutive = self._classify(region_key, msi_score)
+
+            if emit_idx is not None and i not in emit_idx:
+                continue
+
             results.append(MSIResult(
                 region_key=region_key,
                 period=period,
-                msi_score=round(msi_score, 3),
+                msi_score=msi_score,
                 classification=classification,
-                address_update_zscore=round(addr_z, 3),
-                adult_enrolment_zscore=round(adult_z, 3),
-                enrolment_decline_zscore=round(decline_z, 3),
+                address_update_zscore=addr_z,
+                adult_enrolment_zscore=adult_z,
+                enrolment_decline_zscore=decline_z,
                 consecutive_watch_periods=consecutive
             ))
         
-        return sorted(results, key=lambda x: x.msi_score, reverse=True)
+        # State-major, highest MSI first within each state: two stable
+        # sorts keep both keys as C-level attrgetters and let per-state
+        # consumers slice by binary search (see state_slice)
+        results.sort(key=attrgetter("msi_score"), reverse=True)
+        results.sort(key=attrgetter("state"))
+        return results
     
     def compute_demand_proxies(
         self,
         current_data: Dict[str, Dict],
         previous_data: Dict[str, Dict],
-        period: str
+        period: str,
+        columns: Dict = None
     ) -> List[DemandProxy]:
         """
         Compute infrastructure demand proxies.
-        
+
         School Demand = growth(0-5 + 5-17) + net_settlement_gain
         Housing/Transport = growth(18+) + address_update_intensity
+
+        `columns` takes pre-extracted SoA columns (see compute_all) to
+        skip the extraction pass.
         """
+        if HAS_NUMPY and current_data:
+            # Aligned SoA columns: the per-region branches and .get calls
+            # become five whole-column expressions
+            keys = list(current_data.keys())
+            curr = columns if columns is not None else extract_columns(
+                current_data, (
+                    "age_0_5", "age_5_17", "age_18_greater",
+                    "demo_age_5_17", "demo_age_17_",
+                )
+            )
+            prev = _aligned_columns(keys, previous_data, (
+                "age_0_5", "age_5_17", "age_18_greater",
+            ))
+
+            child_growth = growth_rates(
+                curr["age_0_5"] + curr["age_5_17"],
+                prev["age_0_5"] + prev["age_5_17"],
+            )
+            adult_growth = growth_rates(curr["age_18_greater"], prev["age_18_greater"])
+
+            net_settlement = np.maximum(adult_growth, 0.0)
+            demo_total = curr["demo_age_5_17"] + curr["demo_age_17_"]
+            address_intensity = curr["demo_age_17_"] / np.maximum(demo_total, 1.0)
+
+            school_demand = child_growth + net_settlement
+            housing_transport = adult_growth + address_intensity
+
+            results = [
+                DemandProxy(
+                    region_key=region_key,
+                    period=period,
+                    school_demand=school,
+                    housing_transport_demand=housing,
+                    child_growth_rate=child,
+                    adult_growth_rate=adult,
+                    address_intensity=intensity,
+                )
+                for region_key, school, housing, child, adult, intensity in zip(
+                    keys,
+                    school_demand.tolist(),
+                    housing_transport.tolist(),
+                    child_growth.tolist(),
+                    adult_growth.tolist(),
+                    address_intensity.tolist(),
+                )
+            ]
+            results.sort(key=attrgetter("state"))
+            return results
+
         results = []
-        
+
         for region_key, curr in current_data.items():
             prev = previous_data.get(region_key, {})
             
@@ -195,13 +679,14 @@ class MetricsCalculator:
             results.append(DemandProxy(
                 region_key=region_key,
                 period=period,
-                school_demand=round(school_demand, 4),
-                housing_transport_demand=round(housing_transport, 4),
-                child_growth_rate=round(child_growth, 4),
-                adult_growth_rate=round(adult_growth, 4),
-                address_intensity=round(address_intensity, 4)
+                school_demand=school_demand,
+                housing_transport_demand=housing_transport,
+                child_growth_rate=child_growth,
+                adult_growth_rate=adult_growth,
+                address_intensity=address_intensity
             ))
-        
+
+        results.sort(key=attrgetter("state"))
         return results
     
     def compute_mbu_load(
@@ -235,15 +720,28 @@ class MetricsCalculator:
                 period=period,
                 total_mbu_load=total_load,
                 age_5_17_load=age_5_17,
-                backlog_signal=round(backlog_signal, 3),
+                backlog_signal=backlog_signal,
                 priority_rank=0  # Will be set after sorting
             ))
         
         # Assign priority ranks (higher load = higher priority)
-        results.sort(key=lambda x: x.total_mbu_load, reverse=True)
+        if HAS_NUMPY and results:
+            # Stable argsort over one int column instead of N log N
+            # Python comparisons through a key lambda
+            total_loads = np.fromiter(
+                (r.total_mbu_load for r in results), np.int64, len(results)
+            )
+            order = np.argsort(-total_loads, kind="stable")
+            results = [results[i] for i in order]
+        else:
+            results.sort(key=attrgetter("total_mbu_load"), reverse=True)
+
         for i, result in enumerate(results):
             result.priority_rank = i + 1
-        
+
+        # State-major order for state_slice; stable sort keeps the
+        # load-descending order (and ranks) intact within each state
+        results.sort(key=attrgetter("state"))
         return results
 
 
@@ -269,18 +767,19 @@ class InsightGenerator:
         """Generate top N actionable insights for a state"""
         insights = []
         
-        # Filter by state (region_key format: state|district|pincode)
-        state_msi = [r for r in msi_results if r.region_key.split("|")[0] == state]
-        state_demand = [r for r in demand_proxies if r.region_key.split("|")[0] == state]
-        state_mbu = [r for r in mbu_loads if r.region_key.split("|")[0] == state]
+        # Filter by state: the compute_* methods return state-major
+        # order, so each selection is a binary-search range slice
+        state_msi = state_slice(msi_results, state)
+        state_demand = state_slice(demand_proxies, state)
+        state_mbu = state_slice(mbu_loads, state)
         
         # Critical MSI regions
         critical = [r for r in state_msi if r.classification == "Critical"]
         for region in critical[:3]:
             insights.append({
                 "indicator": "MSI (Critical)",
-                "region": self._format_region(region.region_key),
-                "evidence": f"MSI={region.msi_score}, {region.consecutive_watch_periods} consecutive high periods",
+                "region": self._format_region(region),
+                "evidence": f"MSI={region.msi_score:.3f}, {region.consecutive_watch_periods} consecutive high periods",
                 "action": "Priority intervention needed - high settlement instability signals",
                 "department": self.DEPARTMENTS["migration"],
                 "impact": "High",
@@ -288,44 +787,53 @@ class InsightGenerator:
             })
         
         # High school demand
-        high_school = sorted(state_demand, key=lambda x: x.school_demand, reverse=True)[:3]
-        for demand in high_school:
+        high_school = sorted(state_demand, key=attrgetter("school_demand"), reverse=True)[:3]
+        school_conf = clipped_confidences(
+            [d.school_demand for d in high_school], 0.5, 0.9
+        )
+        for demand, confidence in zip(high_school, school_conf):
             if demand.school_demand > 0.1:  # 10% growth threshold
                 insights.append({
                     "indicator": "School Demand Proxy",
-                    "region": self._format_region(demand.region_key),
+                    "region": self._format_region(demand),
                     "evidence": f"Child growth={demand.child_growth_rate:.1%}, Adult settlement gain detected",
                     "action": "Assess school infrastructure capacity",
                     "department": self.DEPARTMENTS["school"],
                     "impact": "Medium" if demand.school_demand < 0.2 else "High",
-                    "confidence": min(0.9, 0.5 + abs(demand.school_demand))
+                    "confidence": confidence
                 })
-        
+
         # High housing/transport demand
-        high_housing = sorted(state_demand, key=lambda x: x.housing_transport_demand, reverse=True)[:2]
-        for demand in high_housing:
+        high_housing = sorted(state_demand, key=attrgetter("housing_transport_demand"), reverse=True)[:2]
+        housing_conf = clipped_confidences(
+            [d.housing_transport_demand for d in high_housing], 0.4, 0.85
+        )
+        for demand, confidence in zip(high_housing, housing_conf):
             if demand.housing_transport_demand > 0.15:
                 insights.append({
                     "indicator": "Housing/Transport Proxy",
-                    "region": self._format_region(demand.region_key),
+                    "region": self._format_region(demand),
                     "evidence": f"Adult growth={demand.adult_growth_rate:.1%}, Address intensity={demand.address_intensity:.1%}",
                     "action": "Review housing and transport infrastructure plans",
                     "department": self.DEPARTMENTS["housing"],
                     "impact": "Medium",
-                    "confidence": min(0.85, 0.4 + abs(demand.housing_transport_demand))
+                    "confidence": confidence
                 })
-        
-        # MBU backlog regions 
+
+        # MBU backlog regions (signals are > 0.3 here, so |x| == x)
         high_backlog = [r for r in state_mbu if r.backlog_signal > 0.3][:2]
-        for mbu in high_backlog:
+        backlog_conf = clipped_confidences(
+            [r.backlog_signal for r in high_backlog], 0.5, 0.9
+        )
+        for mbu, confidence in zip(high_backlog, backlog_conf):
             insights.append({
                 "indicator": "MBU Backlog Signal",
-                "region": self._format_region(mbu.region_key),
+                "region": self._format_region(mbu),
                 "evidence": f"Load={mbu.total_mbu_load}, Backlog signal=+{mbu.backlog_signal:.0%}",
                 "action": "Schedule additional MBU camps in this region",
                 "department": self.DEPARTMENTS["biometric"],
                 "impact": "Medium",
-                "confidence": min(0.9, 0.5 + mbu.backlog_signal)
+                "confidence": confidence
             })
         
         # Sort by impact and confidence
@@ -334,12 +842,11 @@ class InsightGenerator:
         
         return insights[:top_n]
     
-    def _format_region(self, region_key: str) -> str:
-        """Format region key for display"""
-        parts = region_key.split("|")
-        if len(parts) == 3:
-            return f"{parts[1]}, {parts[0]} ({parts[2]})"
-        return region_key
+    def _format_region(self, result) -> str:
+        """Format a result's region for display from its cached parts"""
+        if result.district and result.pincode:
+            return f"{result.district}, {result.state} ({result.pincode})"
+        return result.region_key
     
     def _compute_confidence(self, msi: float, consecutive: int) -> float:
         """Compute confidence score based on signal strength and duration"""